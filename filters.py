@@ -1,8 +1,15 @@
 # --- filters.py ---
 
+import heapq
+import mmap
 import os
+import sys
 import time
-from typing import List, Set, Optional, Callable, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Set, Optional, Callable, Dict, Union
+
+import numpy as np
+
 from models import FileNode
 
 # --- Configuration for Filters ---
@@ -10,39 +17,95 @@ from models import FileNode
 
 # Default patterns for temporary/cache/log files
 # Using lower-case for case-insensitive matching
-TEMP_EXTENSIONS = {
+TEMP_EXTENSIONS = frozenset({
     ".tmp", ".temp", ".log", ".cache", ".bak", ".old", ".thumbcache",
     ".swp", ".swo", ".swn"
-}
+})
 
-TEMP_FILENAMES = {
+TEMP_FILENAMES = frozenset({
     "thumbs.db", "desktop.ini", ".ds_store"
-}
+})
 
-TEMP_DIRNAMES = {
+TEMP_DIRNAMES = frozenset({
     "__pycache__", "node_modules", ".pytest_cache", ".cache",
     "pip_cache"
-}
+})
+
+# --- Structure-of-Arrays Index ---
+
+class FileIndex:
+    """
+    Structure-of-arrays view over a collection of FileNodes.
+
+    Holds the per-node attributes the filters compare against (size,
+    mtime, atime, is_dir) in parallel NumPy arrays, so each filter pass
+    becomes one vectorized mask instead of a Python loop over attribute
+    lookups. Built once by the Scanner and reused by every filter.
+    """
+
+    def __init__(self, files):
+        node_list = list(files)
+        count = len(node_list)
+        self.nodes = np.array(node_list, dtype=object)
+        self.sizes = np.fromiter(
+            (n.size_bytes for n in node_list), dtype=np.int64, count=count)
+        self.mtimes = np.fromiter(
+            (n.mtime for n in node_list), dtype=np.float64, count=count)
+        self.atimes = np.fromiter(
+            (n.atime for n in node_list), dtype=np.float64, count=count)
+        self.is_dir = np.fromiter(
+            (n.is_dir for n in node_list), dtype=bool, count=count)
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+FilterInput = Union[Set[FileNode], List[FileNode], FileIndex]
+
+
+def _as_index(files: FilterInput) -> FileIndex:
+    """Accept either a pre-built FileIndex or a plain node collection."""
+    if isinstance(files, FileIndex):
+        return files
+    return FileIndex(files)
+
+
+# The UI only ever shows the head of each filtered list; sorting the
+# full tail of a million-file result is wasted work. Results are
+# truncated to this many rows via a partial sort.
+DISPLAY_CAP = 2000
+
+
+def _top_nodes(index: FileIndex, idx, keys) -> List[FileNode]:
+    """
+    Returns the nodes at 'idx' ordered by 'keys' ascending, truncated to
+    DISPLAY_CAP. Uses np.argpartition to pre-select the top rows, so
+    only DISPLAY_CAP elements are ever fully sorted.
+    """
+    if len(idx) > DISPLAY_CAP:
+        part = np.argpartition(keys, DISPLAY_CAP)[:DISPLAY_CAP]
+        idx = idx[part]
+        keys = keys[part]
+    order = np.argsort(keys, kind='stable')
+    return index.nodes[idx[order]].tolist()
+
 
 # --- Filter Functions ---
 
-def get_large_files(files: Set[FileNode], min_size_mb: int = 100) -> List[FileNode]:
+def get_large_files(files: FilterInput, min_size_mb: int = 100) -> List[FileNode]:
     """
     Filters for files larger than a specific size.
     Sorts the result from largest to smallest.
     """
     min_size_bytes = min_size_mb * 1000 * 1000  # Use decimal MB
-    large_files = [
-        node for node in files 
-        if not node.is_dir and node.size_bytes > min_size_bytes
-    ]
-    
+    index = _as_index(files)
+
+    idx = np.where((~index.is_dir) & (index.sizes > min_size_bytes))[0]
     # Sort by size, descending
-    large_files.sort(key=lambda x: x.size_bytes, reverse=True)
-    return large_files
+    return _top_nodes(index, idx, -index.sizes[idx])
 
 
-def get_old_files(files: Set[FileNode], min_days_old: int = 365) -> List[FileNode]:
+def get_old_files(files: FilterInput, min_days_old: int = 365) -> List[FileNode]:
     """
     Filters for files last modified more than N days ago.
     Uses 'mtime' (modification time) as it's the most reliable.
@@ -51,172 +114,354 @@ def get_old_files(files: Set[FileNode], min_days_old: int = 365) -> List[FileNod
     now = time.time()
     seconds_ago = min_days_old * 24 * 60 * 60
     cutoff_time = now - seconds_ago
-    
-    old_files = [
-        node for node in files
-        if not node.is_dir and node.mtime < cutoff_time
-    ]
-    
+    index = _as_index(files)
+
+    idx = np.where((~index.is_dir) & (index.mtimes < cutoff_time))[0]
     # Sort by mtime, ascending (oldest first)
-    old_files.sort(key=lambda x: x.mtime, reverse=False)
-    return old_files
+    return _top_nodes(index, idx, index.mtimes[idx])
 
 
-def get_never_accessed_files(files: Set[FileNode], 
+def get_never_accessed_files(files: FilterInput,
                              fallback_to_mtime: bool = True,
                              min_days_old: int = 365) -> List[FileNode]:
     """
     Filters for files last accessed more than N days ago.
-    
+
     NOTE: 'atime' (access time) is often disabled or unreliable on modern OS
     (e.g., Windows, Linux with 'relatime').
-    
-    If 'atime' seems unreliable (e.g., older than mtime), 
+
+    If 'atime' seems unreliable (e.g., older than mtime),
     it can fallback to using 'mtime'.
     """
     now = time.time()
     seconds_ago = min_days_old * 24 * 60 * 60
     cutoff_time = now - seconds_ago
-    
-    unaccessed_files = []
-    for node in files:
-        if node.is_dir:
-            continue
-            
-        time_to_check = node.atime
-        
-        # Fallback logic: If atime is older than mtime, OS probably
-        # isn't updating it. Use mtime instead.
-        if fallback_to_mtime and node.atime < node.mtime:
-            time_to_check = node.mtime
-            
-        if time_to_check < cutoff_time:
-            unaccessed_files.append(node)
-            
+    index = _as_index(files)
+
+    # Fallback logic: If atime is older than mtime, OS probably
+    # isn't updating it. Use mtime instead.
+    if fallback_to_mtime:
+        time_to_check = np.where(
+            index.atimes < index.mtimes, index.mtimes, index.atimes)
+    else:
+        time_to_check = index.atimes
+
+    idx = np.where((~index.is_dir) & (time_to_check < cutoff_time))[0]
     # Sort by atime, ascending (oldest first)
-    unaccessed_files.sort(key=lambda x: x.atime, reverse=False)
-    return unaccessed_files
+    return _top_nodes(index, idx, index.atimes[idx])
 
 
-def get_temp_files(all_nodes: Dict[str, FileNode]) -> List[FileNode]: # <--- PERBAIKAN TIPE HINT
+def is_temp_node(node: FileNode) -> bool:
+    """
+    Single-node temp/junk match: one lowercase conversion and (at most)
+    two O(1) set probes. Matches extensions, filenames and directory
+    names; if a directory matches (e.g., 'node_modules'), the delete op
+    handles its children recursively.
+    """
+    name_lower = node.name.lower()
+    if node.is_dir:
+        return name_lower in TEMP_DIRNAMES
+    return node.ext in TEMP_EXTENSIONS or name_lower in TEMP_FILENAMES
+
+
+def get_temp_files(all_nodes) -> List[FileNode]:
     """
     Filters for temporary files, cache files, logs, and common "junk" folders.
-    Matches against extensions, filenames, and directory names.
-    If a directory matches (e.g., 'node_modules'), all its children are included.
+
+    The scanner stamps is_temp_candidate on every node it builds, so
+    switching back to the Temp tab is just a flag check per node; nodes
+    from other sources are matched (and cached) lazily here.
+
+    Accepts the ScanResult.all_nodes dict or any iterable of FileNodes.
     """
+    nodes = all_nodes.values() if isinstance(all_nodes, dict) else all_nodes
+
     temp_items = []
-    
-    # We need to iterate over the values (FileNode objects), not the keys (paths)
-    for node in all_nodes.values(): # <--- PERBAIKAN LOOP
-        # Check by directory name
-        if node.is_dir and node.name.lower() in TEMP_DIRNAMES:
+    for node in nodes:
+        if node.is_temp_candidate is None:
+            node.is_temp_candidate = is_temp_node(node)
+        if node.is_temp_candidate:
             temp_items.append(node)
-            # Optimization: We could add all children here, but letting
-            # the delete op handle recursion might be safer.
-            continue 
-            
-        # Check by file extension or specific filename
-        if not node.is_dir:
-            name_lower = node.name.lower()
-            if node.ext in TEMP_EXTENSIONS or name_lower in TEMP_FILENAMES:
-                temp_items.append(node)
-                
-    # Sort by size, descending, to show worst offenders first
-    temp_items.sort(key=lambda x: x.size_bytes, reverse=True)
-    return temp_items
+
+    # Top offenders by size, descending; partial sort caps the cost
+    return heapq.nlargest(DISPLAY_CAP, temp_items, key=lambda x: x.size_bytes)
 
 
-def get_zero_byte_files(files: Set[FileNode]) -> List[FileNode]:
+def get_zero_byte_files(files: FilterInput) -> List[FileNode]:
     """
     Filters for files that have a size of exactly 0 bytes.
     """
-    zero_files = [
-        node for node in files
-        if not node.is_dir and node.size_bytes == 0
-    ]
-    # Sort by name
-    zero_files.sort(key=lambda x: x.path, reverse=False)
-    return zero_files
+    index = _as_index(files)
+
+    idx = np.where((~index.is_dir) & (index.sizes == 0))[0]
+    zero_files = index.nodes[idx].tolist()
+    # First by name (paths aren't in the index, so partial-sort the nodes)
+    return heapq.nsmallest(DISPLAY_CAP, zero_files, key=lambda x: x.path)
 
 
 def get_empty_folders(dirs: Set[FileNode]) -> List[FileNode]:
     """
     Filters for directories that contain no files and no sub-directories.
     """
-    empty_dirs = [
-        node for node in dirs
-        if node.is_dir and not node.children
-    ]
-    # Sort by name
-    empty_dirs.sort(key=lambda x: x.path, reverse=False)
-    return empty_dirs
+    empty_dirs = [node for node in dirs if node.is_dir and not node.children]
+
+    # First by name; partial sort caps the cost
+    return heapq.nsmallest(DISPLAY_CAP, empty_dirs, key=lambda x: x.path)
 
 # --- On-Demand Hashing (for Duplicates) ---
 # This is more complex and involves I/O, so it's kept separate.
 
-def compute_hash(file_path: str, buffer_size=65536) -> Optional[str]:
+# Duplicate detection only needs a fast, collision-resistant digest, not
+# a cryptographically standardized one. Prefer BLAKE3 (SIMD-accelerated,
+# multithreaded Rust backend); fall back to stdlib BLAKE2b when the
+# blake3 package isn't installed. Both are much faster than SHA-256.
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+# xxhash is used for the cheap head/tail pre-filter in find_duplicates.
+try:
+    import xxhash as _xxhash
+except ImportError:
+    _xxhash = None
+
+# Below this size the mmap setup cost outweighs the benefit;
+# use the buffered read loop instead.
+MMAP_HASH_THRESHOLD = 1 << 20  # 1 MiB
+
+
+def compute_hash(file_path: str) -> Optional[str]:
     """
-    Calculates the SHA-256 hash for a single file.
+    Calculates the content hash for a single file.
     Returns None on error (e.g., PermissionError).
+
+    Large files are memory-mapped and hashed with a single C-level
+    update call — no Python read loop, and the kernel picks its own
+    readahead size. Small files are read in one shot.
     """
-    import hashlib
-    sha256 = hashlib.sha256()
-    
     try:
-        with open(file_path, 'rb') as f:
-            while True:
-                data = f.read(buffer_size)
-                if not data:
-                    break
-                sha256.update(data)
-        return sha256.hexdigest()
+        size = os.path.getsize(file_path)
+        # Don't let hashing count as the user accessing the file.
+        restore_times = _atime_restore_times(file_path)
+
+        try:
+            if _blake3 is not None:
+                hasher = _blake3(max_threads=_blake3.AUTO)
+                if size >= MMAP_HASH_THRESHOLD:
+                    # The Rust backend maps and reads the file itself,
+                    # so O_NOATIME can't help here — restore instead.
+                    if restore_times is None:
+                        st = os.stat(file_path)
+                        restore_times = (st.st_atime, st.st_mtime)
+                    hasher.update_mmap(file_path)
+                    return hasher.hexdigest()
+            else:
+                import hashlib
+                hasher = hashlib.blake2b()
+
+            fd = _open_noatime(file_path)
+            with os.fdopen(fd, 'rb') as f:
+                if hasattr(os, 'posix_fadvise'):
+                    # Tell the kernel we'll read straight through.
+                    os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+                if size >= MMAP_HASH_THRESHOLD:
+                    with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mm:
+                        hasher.update(mm)
+                else:
+                    hasher.update(f.read())
+            return hasher.hexdigest()
+        finally:
+            _restore_atime(file_path, restore_times)
     except (IOError, PermissionError, OSError) as e:
         print(f"[Hash Error] Could not hash {file_path}: {e}")
         return None
 
 
+def _storage_is_rotational(path: str) -> bool:
+    """
+    Best-effort check whether the device holding 'path' is a spinning
+    disk. Linux exposes this in sysfs; elsewhere assume SSD (the common
+    case on modern machines).
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        st = os.stat(path)
+        base = f"/sys/dev/block/{os.major(st.st_dev)}:{os.minor(st.st_dev)}"
+        # For partitions the rotational flag lives on the parent disk.
+        for probe in (f"{base}/queue/rotational", f"{base}/../queue/rotational"):
+            try:
+                with open(probe) as f:
+                    return f.read().strip() == "1"
+            except OSError:
+                continue
+    except OSError:
+        pass
+    return False
+
+
+def _default_hash_workers(sample_path: Optional[str]) -> int:
+    """
+    Worker count for parallel duplicate hashing.
+
+    HDDs are seek-bound, so concurrent reads thrash the head — stay
+    serial. On SSDs the hash functions release the GIL inside C code
+    and reads queue well, so scale with core count.
+    """
+    if sample_path is None or _storage_is_rotational(sample_path):
+        return 1
+    return min(32, (os.cpu_count() or 4) * 2)
+
+
+# Linux can suppress the atime update at open time; 0 elsewhere.
+O_NOATIME = getattr(os, 'O_NOATIME', 0)
+
+
+def _open_noatime(path: str) -> int:
+    """
+    Opens a file for reading without bumping its access time where the
+    OS supports it. Reading files just to hash them should not count as
+    the user accessing them (it would skew get_never_accessed_files and
+    forces a journal write on many filesystems).
+    """
+    if O_NOATIME:
+        try:
+            return os.open(path, os.O_RDONLY | O_NOATIME)
+        except PermissionError:
+            # O_NOATIME is only allowed on files we own
+            pass
+    return os.open(path, os.O_RDONLY)
+
+
+def _atime_restore_times(path: str):
+    """
+    Returns the (atime, mtime) pair to put back after reading, or None
+    when O_NOATIME makes restoring unnecessary.
+    """
+    if O_NOATIME:
+        return None
+    st = os.stat(path)
+    return (st.st_atime, st.st_mtime)
+
+
+def _restore_atime(path: str, times) -> None:
+    if times is None:
+        return
+    try:
+        os.utime(path, times)
+    except OSError:
+        pass  # Best effort; never fail the hash over it
+
+
+# Bytes read from each end of a file for the partial fingerprint.
+PARTIAL_FP_CHUNK = 65536  # 64 KiB
+
+
+def _partial_fingerprint(path: str, size: int) -> Optional[bytes]:
+    """
+    Cheap fingerprint of a file: a hash of its first and last 64 KiB.
+
+    Same-size files that differ anywhere in the head or tail (the common
+    case for media/downloads) are separated here without reading their
+    full content. Returns None on error.
+    """
+    try:
+        restore_times = _atime_restore_times(path)
+        fd = _open_noatime(path)
+        try:
+            head = os.pread(fd, PARTIAL_FP_CHUNK, 0)
+            tail = b""
+            if size > PARTIAL_FP_CHUNK:
+                tail = os.pread(fd, PARTIAL_FP_CHUNK, size - PARTIAL_FP_CHUNK)
+        finally:
+            os.close(fd)
+            _restore_atime(path, restore_times)
+    except OSError as e:
+        print(f"[Hash Error] Could not fingerprint {path}: {e}")
+        return None
+
+    if _xxhash is not None:
+        return _xxhash.xxh3_128_digest(head + tail)
+    import hashlib
+    return hashlib.blake2b(head + tail, digest_size=16).digest()
+
+
 def find_duplicates(
-    files: Set[FileNode], 
+    files: Set[FileNode],
     progress_callback: Callable[[int, int], None]
 ) -> Dict[str, List[FileNode]]:
     """
-    Finds duplicate files based on SHA-256 hash.
+    Finds duplicate files based on their content hash.
     This is an I/O intensive operation.
-    
+
     Step 1: Group files by size.
-    Step 2: Only hash files that share the same size (groups > 1).
-    Step 3: Group by hash.
+    Step 2: Regroup same-size files by a head/tail fingerprint
+            (classic rdfind/fdupes technique) to avoid full reads
+            of unique-content files that merely share a size.
+    Step 3: Fully hash the surviving candidates and group by hash.
     Step 4: Return groups where hash count > 1.
     """
     from collections import defaultdict
-    
+
     # Step 1: Group by size
     size_groups = defaultdict(list)
     for node in files:
         if not node.is_dir and node.size_bytes > 0: # Ignore 0-byte
             size_groups[node.size_bytes].append(node)
-            
-    # Step 2: Filter for potential duplicates (groups with same size)
-    potential_duplicates = []
+
+    # Filter for potential duplicates (groups with same size)
+    same_size_nodes = []
     for size, nodes in size_groups.items():
+        if len(nodes) > 1:
+            same_size_nodes.extend(nodes)
+
+    # Step 2: Regroup by (size, partial fingerprint); only groups that
+    # still collide need a full content hash.
+    fp_groups = defaultdict(list)
+    for node in same_size_nodes:
+        fp = node.partial_fp
+        if fp is None:
+            fp = _partial_fingerprint(node.path, node.size_bytes)
+            node.partial_fp = fp # Cache the fingerprint
+        if fp is not None:
+            fp_groups[(node.size_bytes, fp)].append(node)
+
+    potential_duplicates = []
+    for nodes in fp_groups.values():
         if len(nodes) > 1:
             potential_duplicates.extend(nodes)
-            
+
     # Step 3: Hash files and group by hash
     hash_groups = defaultdict(list)
     total_files = len(potential_duplicates)
-    
-    for i, node in enumerate(potential_duplicates):
-        progress_callback(i + 1, total_files) # Report progress
-        
+
+    def _hash_node(node: FileNode) -> Optional[str]:
         # Use cached hash if available
-        file_hash = node.hash_sha256
-        if not file_hash:
-            file_hash = compute_hash(node.path)
-            node.hash_sha256 = file_hash # Cache the hash
-            
-        if file_hash:
-            hash_groups[file_hash].append(node)
+        if not node.content_hash:
+            node.content_hash = compute_hash(node.path)
+        return node.content_hash
+
+    # Hash in parallel on SSDs; the hash functions release the GIL in
+    # C code so threads overlap both the reads and the compute.
+    workers = _default_hash_workers(
+        potential_duplicates[0].path if potential_duplicates else None)
+
+    executor = None
+    if workers > 1 and total_files > 1:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        hash_iter = executor.map(_hash_node, potential_duplicates)
+    else:
+        hash_iter = map(_hash_node, potential_duplicates)
+
+    try:
+        for i, (node, file_hash) in enumerate(zip(potential_duplicates, hash_iter)):
+            progress_callback(i + 1, total_files) # Report progress
+            if file_hash:
+                hash_groups[file_hash].append(node)
+    finally:
+        if executor is not None:
+            executor.shutdown()
             
     # Step 4: Filter for actual duplicates (groups with same hash)
     duplicate_sets = {
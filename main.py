@@ -1,5 +1,6 @@
 # --- main.py ---
 
+import heapq
 import os
 import sys
 import threading
@@ -22,9 +23,9 @@ from plyer import filechooser
 # --- Project Imports ---
 from models import FileNode, ScanResult
 import utils
-from scanner import Scanner
+from scanner import Scanner, forget_cached_tree
 import filters
-from delete_ops import delete_selected_items, DeleteResult
+from delete_ops import delete_selected_items, get_top_level_nodes, DeleteResult
 
 # --- Kivy Widget Definitions ---
 
@@ -39,6 +40,7 @@ class FileListItem(BoxLayout):
 class MainLayout(BoxLayout):
     pass
 
+
 # --- Main Application Class ---
 
 class DiskCleanerApp(App):
@@ -50,6 +52,8 @@ class DiskCleanerApp(App):
     current_scan_path: str = ""
     total_drive_bytes: int = 0
     _is_refreshing: bool = False
+    _refresh_pending: bool = False
+    _clear_generation: int = 0
 
     def build(self):
         return Builder.load_file('ui.kv')
@@ -149,47 +153,51 @@ class DiskCleanerApp(App):
         """UI Callback: Populates all UI elements once scan is done."""
         # Simpan hasil lengkap (masih berisi tree) untuk seleksi & duplikat
         self.scan_result = result
+
+        # Batalkan sisa incremental clear agar tidak menghapus data baru
+        self._clear_generation += 1
+        self.root.ids.duplicates_rv.data = []
         
         # --- DIPERBAIKI: Langsung populate RecycleViews dari list yang sudah jadi ---
-        # Ini sangat cepat dan tidak memblokir UI
-        self.root.ids.all_files_rv.data = [
-            {'node': n} for n in filtered_lists['all_files']
-        ]
-        self.root.ids.large_files_rv.data = [
-            {'node': n} for n in filtered_lists['large']
-        ]
-        self.root.ids.old_files_rv.data = [
-            {'node': n} for n in filtered_lists['old']
-        ]
-        self.root.ids.temp_files_rv.data = [
-            {'node': n} for n in filtered_lists['temp']
-        ]
-        self.root.ids.zero_empty_rv.data = [
-            {'node': n} for n in filtered_lists['zero_empty']
-        ]
+        # (Kivy menyalin assignment .data ke ObservableList, jadi row
+        # dict memang harus dibuat di sini — tidak ada jalan lazy lewat
+        # properti .data)
+        self.root.ids.all_files_rv.data = [{'node': n} for n in filtered_lists['all_files']]
+        self.root.ids.large_files_rv.data = [{'node': n} for n in filtered_lists['large']]
+        self.root.ids.old_files_rv.data = [{'node': n} for n in filtered_lists['old']]
+        self.root.ids.temp_files_rv.data = [{'node': n} for n in filtered_lists['temp']]
+        self.root.ids.zero_empty_rv.data = [{'node': n} for n in filtered_lists['zero_empty']]
         
         self.set_ui_state('ready')
         self.scanner_thread = None
 
     # --- 2. UI Population ---
 
+    # RecycleViews cleared incrementally by clear_all_data
+    _RV_IDS = ('all_files_rv', 'large_files_rv', 'old_files_rv',
+               'temp_files_rv', 'zero_empty_rv', 'duplicates_rv')
+
     def clear_all_data(self):
         """Resets the UI and internal data to a clean state."""
         self.scan_result = None
         self.selected_nodes.clear()
-        
-        # --- DIPERBAIKI: Hapus referensi ke tree_view ---
-        # Clear RecycleViews
-        self.root.ids.all_files_rv.data = []
-        self.root.ids.large_files_rv.data = []
-        self.root.ids.old_files_rv.data = []
-        self.root.ids.temp_files_rv.data = []
-        self.root.ids.zero_empty_rv.data = []
-        self.root.ids.duplicates_rv.data = []
-        
+
+        # Clear the RecycleViews one per frame instead of all at once:
+        # tearing down the previous scan's rows then happens in several
+        # short pauses rather than one long synchronous stall.
+        self._clear_generation += 1
+        self._clear_one_rv(self._clear_generation, 0)
+
         self.root.ids.duplicates_status_label.text = "Scan for duplicates by hashing files."
         self.update_selection_summary()
 
+    def _clear_one_rv(self, generation: int, index: int, dt=0):
+        # A newer scan may have repopulated the views; stop clearing then.
+        if generation != self._clear_generation or index >= len(self._RV_IDS):
+            return
+        self.root.ids[self._RV_IDS[index]].data = []
+        Clock.schedule_once(partial(self._clear_one_rv, generation, index + 1))
+
     # --- DIPERBAIKI: Hapus fungsi populate_tree_view dan populate_filter_tabs ---
     # (Fungsi-fungsi tersebut tidak diperlukan lagi)
 
@@ -205,25 +213,46 @@ class DiskCleanerApp(App):
         if not node:
             return
             
-        # Logika rekursif masih berfungsi karena self.scan_result.root_node
+        # Logika ini masih berfungsi karena self.scan_result.root_node
         # masih menyimpan struktur pohon di memori.
-        self._set_node_selected_recursive(node, active)
+        self._set_node_selected(node, active)
         
         if not active:
             self._update_parents_on_uncheck(node.parent)
             
         self.update_selection_summary()
-        self._refresh_all_ui_selections()
+        self._request_ui_refresh()
+
+    def _set_node_selected(self, node: FileNode, active: bool):
+        """
+        Marks a node and its whole subtree (de)selected.
+
+        Walks an explicit stack instead of recursing — no Python frame
+        per node, no RecursionError on deep trees — and applies the
+        selection set change as one bulk C-level update at the end.
+        """
+        # Bind the hot-loop methods once; this loop runs per node of the
+        # toggled subtree and the attribute lookups add up.
+        stack = [node]
+        stack_pop = stack.pop
+        stack_extend = stack.extend
+        nodes_changed = []
+        changed_append = nodes_changed.append
+        while stack:
+            n = stack_pop()
+            # Subtree already in the requested state — nothing to do.
+            # (Safe: checking a node always marks its whole subtree, and
+            # unchecking a descendant always unchecks its ancestors.)
+            if n.selected == active:
+                continue
+            n.selected = active
+            changed_append(n)
+            stack_extend(n.children)
 
-    def _set_node_selected_recursive(self, node: FileNode, active: bool):
-        node.selected = active
         if active:
-            self.selected_nodes.add(node)
+            self.selected_nodes.update(nodes_changed)
         else:
-            self.selected_nodes.discard(node)
-            
-        for child in node.children:
-            self._set_node_selected_recursive(child, active)
+            self.selected_nodes.difference_update(nodes_changed)
 
     def _update_parents_on_uncheck(self, parent: Optional[FileNode]):
         while parent:
@@ -235,20 +264,9 @@ class DiskCleanerApp(App):
                 break
 
     def update_selection_summary(self):
-        total_size = 0
-        paths_to_delete = {n.path for n in self.selected_nodes}
-        top_level_selected = []
-        for node in self.selected_nodes:
-            is_child_of_selected = False
-            parent = node.parent
-            while parent:
-                if parent.path in paths_to_delete:
-                    is_child_of_selected = True
-                    break
-                parent = parent.parent
-            if not is_child_of_selected:
-                top_level_selected.append(node)
-                
+        # Count only top-level items so nested selections aren't
+        # double-counted (same redundancy filter the delete op uses).
+        top_level_selected = get_top_level_nodes(list(self.selected_nodes))
         total_size = sum(n.size_bytes for n in top_level_selected)
         count = len(self.selected_nodes)
         
@@ -256,6 +274,21 @@ class DiskCleanerApp(App):
             f"Selected: {count} items ({utils.format_bytes(total_size)})"
         self.root.ids.delete_button.disabled = (count == 0)
 
+    def _request_ui_refresh(self):
+        """
+        Coalesces RecycleView refreshes onto the next frame. Rapid
+        selection events (e.g., shift-clicking many rows) then cost one
+        layout pass per frame instead of one per event.
+        """
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        Clock.schedule_once(self._flush_ui_refresh, 0)
+
+    def _flush_ui_refresh(self, dt):
+        self._refresh_pending = False
+        self._refresh_all_ui_selections()
+
     # --- DIPERBAIKI: Logika refresh sekarang hanya me-refresh RecycleViews ---
     def _refresh_all_ui_selections(self):
         """
@@ -341,6 +374,12 @@ class DiskCleanerApp(App):
             use_permanent_delete=is_permanent,
             progress_callback=on_progress
         )
+
+        # Drop cached listings under the deleted items so the automatic
+        # rescan re-reads them from disk.
+        for node in get_top_level_nodes(nodes):
+            forget_cached_tree(node.path)
+
         Clock.schedule_once(lambda dt: self._on_delete_complete(result))
         
     def _on_delete_complete(self, result: DeleteResult):
@@ -400,10 +439,16 @@ class DiskCleanerApp(App):
         for file_hash, nodes in duplicate_sets.items():
             flat_list.extend(nodes)
             
-        flat_list.sort(key=lambda n: n.size_bytes, reverse=True)
+        # Partial sort: only the displayed head gets ordered. Duplicate
+        # sets share a size, so group members stay adjacent.
+        total_files = len(flat_list)
+        flat_list = heapq.nlargest(
+            filters.DISPLAY_CAP, flat_list, key=lambda n: n.size_bytes)
         self.root.ids.duplicates_rv.data = [{'node': n} for n in flat_list]
-        self.root.ids.duplicates_status_label.text = \
-            f"Found {len(duplicate_sets)} sets of duplicates ({len(flat_list)} total files)."
+        status = f"Found {len(duplicate_sets)} sets of duplicates ({total_files} total files)."
+        if total_files > len(flat_list):
+            status += f" Showing the {len(flat_list)} largest."
+        self.root.ids.duplicates_status_label.text = status
         self.root.ids.scan_duplicates_button.disabled = False
 
     # --- Helper Methods (Tidak berubah) ---
@@ -1,14 +1,39 @@
 # --- models.py ---
 
+import sys
 import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence
 
-@dataclass
+
+@lru_cache(maxsize=1024)
+def _ext_of(name: str) -> str:
+    """
+    Lowercased, interned extension for a file name ("" when there is
+    none). Interning means every node with the same extension shares one
+    string object — set probes in the temp filter hash a cached value —
+    and the LRU table skips the rfind/lower for repeated names.
+    """
+    i = name.rfind('.')
+    # i > 0 so dotfiles like ".bashrc" count as having no extension
+    return sys.intern(name[i:].lower()) if i > 0 else ""
+
+
+# Shared "no children" sentinel for file nodes. Immutable on purpose:
+# appending a child to a file is a bug, and a tuple raises instead of
+# silently mutating state shared by every file in the scan.
+_NO_CHILDREN: Sequence['FileNode'] = ()
+
+@dataclass(eq=False, slots=True)
 class FileNode:
     """
     Represents a single file or directory node found during the scan.
     This is a pure data class.
+
+    Slotted: a scan allocates one of these per file, so dropping the
+    per-instance __dict__ saves a few hundred bytes per node and makes
+    attribute reads in the filter loops cheaper.
     """
     path: str
     name: str
@@ -22,37 +47,56 @@ class FileNode:
 
     ext: str = ""  # File extension (e.g., ".txt")
     
-    # Tree structure
+    # Tree structure. Directories get a real list; files share one
+    # immutable empty sequence (see __post_init__) — a scan allocates a
+    # node per file, and an empty list header apiece is pure waste.
     parent: Optional['FileNode'] = None
-    children: List['FileNode'] = field(default_factory=list)
+    children: Optional[Sequence['FileNode']] = None
+
+    # Paths of all ancestors, built incrementally from the parent's set.
+    # Lets "is this node under a selected directory?" be answered with a
+    # single C-level set intersection instead of a parent-pointer walk.
+    ancestor_paths: FrozenSet[str] = frozenset()
     
     # State for UI interaction
     # This will be manipulated by the UI and read by delete_ops
     selected: bool = False
-    
+
+    # Whether the node matches the temp/junk patterns. Computed once by
+    # the scanner (or lazily by get_temp_files) so tab refreshes don't
+    # re-run the name matching for every node.
+    is_temp_candidate: Optional[bool] = None
+
     # On-demand properties
-    hash_sha256: Optional[str] = None
+    content_hash: Optional[str] = None
+    partial_fp: Optional[bytes] = None  # Head/tail fingerprint (dedup pre-filter)
     
     # Error handling
     scan_error: Optional[str] = None # e.g., "Permission Denied"
 
     def __post_init__(self):
+        # Files share the immutable empty-children sentinel; only
+        # directories pay for a list (a tuple also fails loudly if
+        # something ever tries to append a child to a file).
+        if self.children is None:
+            self.children = [] if self.is_dir else _NO_CHILDREN
+
         # Automatically populate extension if it's a file
-        if not self.is_dir and '.' in self.name:
-            self.ext = f".{self.name.split('.')[-1].lower()}"
+        if not self.is_dir:
+            self.ext = _ext_of(self.name)
 
-    def __hash__(self):
-        # Enable adding FileNode objects to sets or dict keys
-        return hash(self.path)
+        # Derive the ancestor set from the parent (ancestor chains are
+        # shallow, so these frozensets stay small).
+        if self.parent is not None and not self.ancestor_paths:
+            self.ancestor_paths = self.parent.ancestor_paths | {self.parent.path}
 
-    def __eq__(self, other):
-        # Define equality based on the unique path
-        if not isinstance(other, FileNode):
-            return False
-        return self.path == other.path
+    # eq=False keeps object-identity hashing/equality: each path is
+    # materialized as exactly one node per scan, so identity is
+    # equivalent to path equality — and set/dict operations on the big
+    # all_files/all_dirs collections skip rehashing the path string.
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanResult:
     """
     Holds the complete result of a directory scan.
@@ -63,9 +107,12 @@ class ScanResult:
     # We store them in a dict for O(1) lookup by path
     all_nodes: Dict[str, FileNode] = field(default_factory=dict)
     
-    # Quick-access sets for category tabs
-    all_files: Set[FileNode] = field(default_factory=set)
-    all_dirs: Set[FileNode] = field(default_factory=set)
+    # Quick-access lists for category tabs. Plain lists, not sets: each
+    # node is appended exactly once during the scan, and these are only
+    # ever iterated — appends skip hashing and iteration stays in
+    # insertion order.
+    all_files: List[FileNode] = field(default_factory=list)
+    all_dirs: List[FileNode] = field(default_factory=list)
 
     # Summary statistics
     total_size_bytes: int = 0
@@ -73,4 +120,9 @@ class ScanResult:
     total_dirs_count: int = 0
     
     # Errors encountered during the scan
-    scan_errors: List[str] = field(default_factory=list) # List of paths that failed
\ No newline at end of file
+    scan_errors: List[str] = field(default_factory=list) # List of paths that failed
+
+    # SoA column index over all_files (a filters.FileIndex — typed
+    # loosely to avoid a models->filters import cycle). Built once by
+    # the scanner after the walk; the vectorized filters all reuse it.
+    file_index: Optional[object] = None
\ No newline at end of file
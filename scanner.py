@@ -1,15 +1,145 @@
 # --- scanner.py ---
 
+import collections
+import multiprocessing
 import os
+import sys
 import threading
 import time
-from typing import Callable, Optional, Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Dict, List, Any, Tuple
 
 # Import models dan utilities
 from models import FileNode, ScanResult
-from utils import is_symlink
 import filters # Import semua filter
 
+# --- Cache listing direktori (mempercepat re-scan) ---
+# path -> (dir_mtime, cached_at, skip_symlinks, entries) dengan entries
+# berupa tuple (name, is_dir, size, mtime, atime, ctime). POSIX hanya
+# menyentuh mtime direktori saat entri ditambah/dihapus, jadi selain
+# kunci mtime ada TTL dan API invalidasi eksplisit per prefix.
+_DIR_CACHE: Dict[str, Tuple[float, float, bool, List[tuple]]] = {}
+DIR_CACHE_TTL = 30.0
+_dir_cache_lock = threading.Lock()
+
+
+def _evict_expired_cache() -> None:
+    """
+    Sweeps out cache entries past the TTL. The TTL is checked on read,
+    but without a sweep the expired entries (one tuple per scanned
+    file) would sit in memory forever; running this at scan start keeps
+    the cache bounded to at most one TTL window of listings.
+    """
+    deadline = time.monotonic() - DIR_CACHE_TTL
+    with _dir_cache_lock:
+        stale = [p for p, entry in _DIR_CACHE.items() if entry[1] < deadline]
+        for path in stale:
+            del _DIR_CACHE[path]
+
+
+def forget_cached_tree(prefix: str) -> None:
+    """
+    Drops cached listings for a directory and everything under it.
+    Called after deletions so the follow-up scan re-reads those paths.
+    """
+    sub_prefix = prefix.rstrip(os.sep) + os.sep
+    with _dir_cache_lock:
+        stale = [p for p in _DIR_CACHE if p == prefix or p.startswith(sub_prefix)]
+        for path in stale:
+            del _DIR_CACHE[path]
+
+
+def _scan_subtree(task: Tuple[str, bool]):
+    """
+    Worker proses untuk scan paralel: memindai satu subtree secara
+    iteratif dan mengembalikan tuple polos (jauh lebih cepat di-pickle
+    daripada objek FileNode).
+
+    Returns (entries, dir_errors, dir_mtimes):
+      entries    — (path, name, is_dir, size, mtime, atime, ctime,
+                    parent_path, error_str, error_type)
+      dir_errors — (dir_path, error_str, summary_message)
+      dir_mtimes — (dir_path, dir_mtime) untuk direktori yang dipindai
+                   tanpa error; proses utama memakainya untuk mengisi
+                   cache listing (pool worker tidak berbagi memori).
+    """
+    root_path, skip_symlinks = task
+    entries = []
+    dir_errors = []
+    dir_mtimes = []
+    pending = [root_path]
+
+    # Ikat method di luar loop: loop ini berjalan sekali per entri,
+    # jadi setiap lookup atribut yang dihindari terasa di tree besar.
+    entries_append = entries.append
+    pending_append = pending.append
+    scandir = os.scandir
+
+    while pending:
+        current = pending.pop()
+        try:
+            dir_mtime = os.stat(current).st_mtime
+        except OSError:
+            dir_mtime = None
+        clean = dir_mtime is not None
+
+        try:
+            with scandir(current) as it:
+                for entry in it:
+                    entry_path = entry.path
+
+                    # DirEntry.is_symlink() reads the d_type cached by
+                    # scandir — no extra lstat per entry.
+                    if skip_symlinks and entry.is_symlink():
+                        continue
+
+                    # Directories need no stat at all: d_type answers
+                    # is_dir, their size comes from their children, and
+                    # the UI shows no directory timestamps.
+                    if entry.is_dir(follow_symlinks=False):
+                        entries_append((
+                            entry_path, entry.name, True,
+                            0, 0.0, 0.0, 0.0, current, None, None
+                        ))
+                        pending_append(entry_path)
+                        continue
+
+                    try:
+                        stat = entry.stat(follow_symlinks=False)
+                    except (PermissionError, FileNotFoundError, OSError) as e:
+                        entries_append((
+                            entry_path, entry.name, False,
+                            0, 0.0, 0.0, 0.0, current,
+                            str(e), type(e).__name__
+                        ))
+                        clean = False
+                        continue
+
+                    entries_append((
+                        entry_path, entry.name, False,
+                        stat.st_size,
+                        stat.st_mtime, stat.st_atime, stat.st_ctime,
+                        current, None, None
+                    ))
+
+        except PermissionError as e:
+            dir_errors.append((
+                current, str(e),
+                f"Cannot scan directory: {current} (Permission Denied)"
+            ))
+            continue
+        except OSError as e:
+            dir_errors.append((
+                current, str(e),
+                f"Error scanning directory: {current} ({e})"
+            ))
+            continue
+
+        if clean:
+            dir_mtimes.append((current, dir_mtime))
+
+    return entries, dir_errors, dir_mtimes
+
 class Scanner(threading.Thread):
     """
     Runs the directory scan and filtering in a separate thread.
@@ -38,6 +168,11 @@ class Scanner(threading.Thread):
         self._running_event = threading.Event()
         self._running_event.set()
 
+        # Progress throttling: per-directory updates are capped at
+        # ~30 Hz so a million-file scan doesn't flood the UI thread
+        # with callbacks faster than it can repaint.
+        self._last_progress_t = 0.0
+
     def run(self):
         """The main entry point for the thread."""
         try:
@@ -48,7 +183,7 @@ class Scanner(threading.Thread):
             try:
                 stat = os.stat(self.root_path)
                 root_node = FileNode(
-                    path=self.root_path,
+                    path=sys.intern(self.root_path),
                     name=os.path.basename(self.root_path) or self.root_path,
                     is_dir=True,
                     size_bytes=0,
@@ -62,18 +197,40 @@ class Scanner(threading.Thread):
                 
             scan_result = ScanResult(root_node=root_node)
             scan_result.all_nodes[root_node.path] = root_node
-            scan_result.all_dirs.add(root_node)
+            scan_result.all_dirs.append(root_node)
             scan_result.total_dirs_count = 1
 
-            # --- Langkah 1: Pindai disk secara rekursif ---
-            self._scan_recursive(self.root_path, root_node, scan_result)
+            # Buang entri cache yang sudah lewat TTL sebelum mulai
+            _evict_expired_cache()
+
+            # --- Langkah 1: Pindai disk ---
+            # Level teratas dipindai di proses ini; tiap subdirektori
+            # menjadi satu task untuk pool proses (melewati GIL).
+            top_dirs = self._scan_single_dir(self.root_path, root_node, scan_result)
+
+            worker_count = min(os.cpu_count() or 1, len(top_dirs))
+            if worker_count > 1:
+                try:
+                    self._scan_parallel(top_dirs, worker_count, scan_result)
+                except (OSError, multiprocessing.ProcessError):
+                    # Pool tidak bisa dibuat (mis. resource limit) —
+                    # jatuh kembali ke scan serial
+                    for dir_node in top_dirs:
+                        if not self._running_event.is_set():
+                            break
+                        self._scan_serial(dir_node.path, dir_node, scan_result)
+            else:
+                for dir_node in top_dirs:
+                    if not self._running_event.is_set():
+                        break
+                    self._scan_serial(dir_node.path, dir_node, scan_result)
 
             if not self._running_event.is_set():
                 return # Dibatalkan
 
             # --- Langkah 2: Hitung ukuran folder (masih di thread) ---
             self.on_progress("Calculating folder sizes...")
-            root_node.size_bytes = self._calculate_folder_size(root_node)
+            self._aggregate_folder_sizes(scan_result)
             scan_result.total_size_bytes = root_node.size_bytes
 
             if not self._running_event.is_set():
@@ -81,27 +238,33 @@ class Scanner(threading.Thread):
 
             # --- Langkah 3: Terapkan semua filter (masih di thread) ---
             self.on_progress("Filtering results...")
-            
-            # Buat list datar untuk RecycleView "All Files (List)"
-            all_files_list = sorted(
-                scan_result.all_files, 
-                key=lambda x: x.path
-            )
-            
-            # Buat list filter lainnya
-            large_files = filters.get_large_files(scan_result.all_files)
-            old_files = filters.get_old_files(scan_result.all_files)
-            temp_files = filters.get_temp_files(scan_result.all_nodes) # all_nodes adalah Dict
-            zero_files = filters.get_zero_byte_files(scan_result.all_files)
-            empty_dirs = filters.get_empty_folders(scan_result.all_dirs)
-            
+
+            # Bangun index SoA sekali, lalu semua filter memakai array yang sama
+            file_index = filters.FileIndex(scan_result.all_files)
+            scan_result.file_index = file_index
+
+            # Jalankan filter yang saling independen secara bersamaan.
+            # Perbandingan NumPy dan sort C-level melepas GIL, jadi
+            # tahap ini hanya selama filter yang paling lambat.
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                # List datar untuk RecycleView "All Files (List)"
+                all_files_fut = executor.submit(
+                    sorted, scan_result.all_files, key=lambda x: x.path)
+                large_fut = executor.submit(filters.get_large_files, file_index)
+                old_fut = executor.submit(filters.get_old_files, file_index)
+                temp_fut = executor.submit(
+                    filters.get_temp_files, scan_result.all_nodes)  # all_nodes adalah Dict
+                zero_fut = executor.submit(filters.get_zero_byte_files, file_index)
+                empty_fut = executor.submit(
+                    filters.get_empty_folders, scan_result.all_dirs)
+
             # Kumpulkan semua hasil filter ke dalam satu dict
             filtered_lists = {
-                "all_files": all_files_list,
-                "large": large_files,
-                "old": old_files,
-                "temp": temp_files,
-                "zero_empty": zero_files + empty_dirs
+                "all_files": all_files_fut.result(),
+                "large": large_fut.result(),
+                "old": old_fut.result(),
+                "temp": temp_fut.result(),
+                "zero_empty": zero_fut.result() + empty_fut.result()
             }
 
             if self._running_event.is_set():
@@ -111,70 +274,294 @@ class Scanner(threading.Thread):
         except Exception as e:
             self.on_error(f"An unexpected error occurred: {e}")
 
-    def _scan_recursive(self, current_path: str, parent_node: FileNode, scan_result: ScanResult):
-        """Helper function to perform the recursive directory traversal."""
-        
-        self.on_progress(current_path)
+    def _report_progress(self, current_path: str):
+        """Forwards a per-directory progress update, rate-limited to
+        ~30 Hz. Stage-change messages bypass this and always fire."""
+        t = time.monotonic()
+        if t - self._last_progress_t >= 0.033:
+            self._last_progress_t = t
+            self.on_progress(current_path)
+
+    def _scan_serial(self, current_path: str, parent_node: FileNode, scan_result: ScanResult):
+        """
+        Serial traversal as an explicit BFS queue. No Python recursion,
+        so deep trees can't hit the recursion limit, and cancellation is
+        checked once per directory instead of per stack frame.
+        """
+        queue = collections.deque([(current_path, parent_node)])
+        while queue and self._running_event.is_set():
+            path, parent = queue.popleft()
+            for dir_node in self._scan_single_dir(path, parent, scan_result):
+                queue.append((dir_node.path, dir_node))
+
+    def _scan_single_dir(self, current_path: str, parent_node: FileNode,
+                         scan_result: ScanResult) -> List[FileNode]:
+        """
+        Scans the immediate entries of one directory (no recursion) and
+        returns the subdirectory nodes it created.
+
+        Listings are cached keyed on the directory's mtime, so a re-scan
+        of an unchanged directory replays the cached entries instead of
+        redoing the scandir/stat calls.
+        """
+        self._report_progress(current_path)
+
+        try:
+            dir_mtime = os.stat(current_path).st_mtime
+        except OSError:
+            dir_mtime = None
+
+        if dir_mtime is not None:
+            with _dir_cache_lock:
+                cached = _DIR_CACHE.get(current_path)
+            if (cached is not None
+                    and cached[0] == dir_mtime
+                    and cached[2] == self.skip_symlinks
+                    and time.monotonic() - cached[1] < DIR_CACHE_TTL):
+                return self._replay_cached_dir(
+                    current_path, cached[3], parent_node, scan_result)
+
+        sub_dirs: List[FileNode] = []
+        # Entries collected for the cache; dropped (None) if anything in
+        # this directory errors, so replays never have to fabricate
+        # error nodes.
+        cache_entries: Optional[List[tuple]] = [] if dir_mtime is not None else None
 
         try:
             with os.scandir(current_path) as it:
                 for entry in it:
                     if not self._running_event.is_set():
-                        return
+                        return sub_dirs
 
-                    entry_path = entry.path
+                    # Intern the path: the same string is re-hashed by every
+                    # membership test later (selection sets, delete filters),
+                    # and interning caches the hash and dedups the buffer.
+                    entry_path = sys.intern(entry.path)
 
-                    if self.skip_symlinks and is_symlink(entry_path):
+                    # d_type is cached by scandir, so this is syscall-free
+                    if self.skip_symlinks and entry.is_symlink():
                         continue
 
-                    try:
-                        stat = entry.stat(follow_symlinks=False)
-                    except (PermissionError, FileNotFoundError, OSError) as e:
-                        error_node = FileNode(
-                            path=entry_path, name=entry.name, is_dir=entry.is_dir(),
-                            size_bytes=0, mtime=0, atime=0, ctime=0,
-                            parent=parent_node, scan_error=str(e)
+                    # Directories skip the stat entirely (see the worker
+                    # for the rationale); only files pay the syscall.
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if is_dir:
+                        node = FileNode(
+                            path=entry_path, name=entry.name, is_dir=True,
+                            size_bytes=0, mtime=0.0, atime=0.0, ctime=0.0,
+                            parent=parent_node
                         )
-                        parent_node.children.append(error_node)
-                        scan_result.all_nodes[error_node.path] = error_node
-                        scan_result.scan_errors.append(f"Cannot access: {entry_path} ({type(e).__name__})")
-                        continue
+                    else:
+                        try:
+                            stat = entry.stat(follow_symlinks=False)
+                        except (PermissionError, FileNotFoundError, OSError) as e:
+                            error_node = FileNode(
+                                path=entry_path, name=entry.name, is_dir=False,
+                                size_bytes=0, mtime=0, atime=0, ctime=0,
+                                parent=parent_node, scan_error=str(e)
+                            )
+                            parent_node.children.append(error_node)
+                            scan_result.all_nodes[error_node.path] = error_node
+                            scan_result.scan_errors.append(f"Cannot access: {entry_path} ({type(e).__name__})")
+                            cache_entries = None
+                            continue
 
-                    is_dir = entry.is_dir(follow_symlinks=False)
-                    node = FileNode(
-                        path=entry_path, name=entry.name, is_dir=is_dir,
-                        size_bytes=stat.st_size if not is_dir else 0,
-                        mtime=stat.st_mtime, atime=stat.st_atime, ctime=stat.st_ctime,
-                        parent=parent_node
-                    )
+                        node = FileNode(
+                            path=entry_path, name=entry.name, is_dir=False,
+                            size_bytes=stat.st_size,
+                            mtime=stat.st_mtime, atime=stat.st_atime, ctime=stat.st_ctime,
+                            parent=parent_node
+                        )
+
+                    # Stamp the temp flag now, while we're touching the
+                    # node anyway; tab refreshes then skip the matching.
+                    node.is_temp_candidate = filters.is_temp_node(node)
 
                     parent_node.children.append(node)
                     scan_result.all_nodes[node.path] = node
-                    
+
+                    if cache_entries is not None:
+                        cache_entries.append((
+                            node.name, is_dir, node.size_bytes,
+                            node.mtime, node.atime, node.ctime
+                        ))
+
                     if is_dir:
-                        scan_result.all_dirs.add(node)
+                        scan_result.all_dirs.append(node)
                         scan_result.total_dirs_count += 1
-                        self._scan_recursive(entry_path, node, scan_result)
+                        sub_dirs.append(node)
                     else:
-                        scan_result.all_files.add(node)
+                        scan_result.all_files.append(node)
                         scan_result.total_files_count += 1
                         # (Total size akan dihitung nanti)
 
         except PermissionError as e:
             parent_node.scan_error = str(e)
             scan_result.scan_errors.append(f"Cannot scan directory: {current_path} (Permission Denied)")
+            cache_entries = None
         except OSError as e:
             parent_node.scan_error = str(e)
             scan_result.scan_errors.append(f"Error scanning directory: {current_path} ({e})")
+            cache_entries = None
 
-    def _calculate_folder_size(self, node: FileNode) -> int:
-        """Recursively calculates folder size *after* scan is complete."""
-        if not node.is_dir:
-            return node.size_bytes
-        
-        size = sum(self._calculate_folder_size(child) for child in node.children)
-        node.size_bytes = size
-        return size
+        if cache_entries is not None:
+            with _dir_cache_lock:
+                _DIR_CACHE[current_path] = (
+                    dir_mtime, time.monotonic(), self.skip_symlinks, cache_entries)
+
+        return sub_dirs
+
+    def _replay_cached_dir(self, current_path: str, entries: List[tuple],
+                           parent_node: FileNode,
+                           scan_result: ScanResult) -> List[FileNode]:
+        """Rebuilds one directory's children from a cached listing —
+        zero scandir/stat syscalls for an unchanged directory."""
+        sub_dirs: List[FileNode] = []
+        join = os.path.join
+
+        for name, is_dir, size, mtime, atime, ctime in entries:
+            node = FileNode(
+                path=sys.intern(join(current_path, name)), name=name,
+                is_dir=is_dir, size_bytes=size,
+                mtime=mtime, atime=atime, ctime=ctime,
+                parent=parent_node
+            )
+            node.is_temp_candidate = filters.is_temp_node(node)
+            parent_node.children.append(node)
+            scan_result.all_nodes[node.path] = node
+
+            if is_dir:
+                scan_result.all_dirs.append(node)
+                scan_result.total_dirs_count += 1
+                sub_dirs.append(node)
+            else:
+                scan_result.all_files.append(node)
+                scan_result.total_files_count += 1
+
+        return sub_dirs
+
+    def _cache_is_fresh(self, path: str) -> bool:
+        """True when 'path' has a cache entry that is within the TTL,
+        matches the current symlink setting, and whose directory mtime
+        is unchanged on disk."""
+        with _dir_cache_lock:
+            cached = _DIR_CACHE.get(path)
+        if (cached is None
+                or cached[2] != self.skip_symlinks
+                or time.monotonic() - cached[1] >= DIR_CACHE_TTL):
+            return False
+        try:
+            return os.stat(path).st_mtime == cached[0]
+        except OSError:
+            return False
+
+    def _scan_parallel(self, top_dirs: List[FileNode], worker_count: int,
+                       scan_result: ScanResult):
+        """
+        Farms the top-level subtrees out to a process pool and stitches
+        the returned flat tuples into the FileNode tree as each worker
+        finishes. Workers do the scandir/stat storm; the main process
+        only links nodes.
+
+        Pool workers don't share the listing cache, so subtrees whose
+        root has a fresh cache entry are replayed here in-process (the
+        serial walk hits the cache per directory) and only cache misses
+        are dispatched to the pool. Workers report back each scanned
+        directory's mtime, and the merge uses that to populate the
+        cache — so a parallel cold scan still warms it for the next
+        re-scan.
+        """
+        pooled_dirs = []
+        for dir_node in top_dirs:
+            if not self._running_event.is_set():
+                return
+            if self._cache_is_fresh(dir_node.path):
+                self._scan_serial(dir_node.path, dir_node, scan_result)
+            else:
+                pooled_dirs.append(dir_node)
+
+        if not pooled_dirs or not self._running_event.is_set():
+            return
+
+        tasks = [(dir_node.path, self.skip_symlinks) for dir_node in pooled_dirs]
+        workers = min(worker_count, len(pooled_dirs))
+        with multiprocessing.Pool(processes=workers) as pool:
+            for entries, dir_errors, dir_mtimes in pool.imap_unordered(_scan_subtree, tasks):
+                if not self._running_event.is_set():
+                    break  # 'with' men-terminate pool saat keluar
+                if entries:
+                    self._report_progress(entries[0][7])
+                self._merge_subtree(entries, dir_errors, dir_mtimes, scan_result)
+
+    def _merge_subtree(self, entries, dir_errors, dir_mtimes,
+                       scan_result: ScanResult):
+        """Links one worker's flat entry list into the FileNode tree.
+        Workers emit parents before their children, so one pass links
+        everything. Directories the worker scanned cleanly (listed in
+        dir_mtimes) also get their listings written to the cache."""
+        all_nodes = scan_result.all_nodes
+
+        # Listings per direktori bersih, diisi sambil menautkan node.
+        # Direktori yang punya entri error tidak ada di dir_mtimes, jadi
+        # replay tidak pernah perlu memalsukan error node.
+        listings: Dict[str, List[tuple]] = {path: [] for path, _ in dir_mtimes}
+
+        for (path, name, is_dir, size, mtime, atime, ctime,
+             parent_path, error_str, error_type) in entries:
+            parent_node = all_nodes.get(parent_path)
+            if parent_node is None:
+                continue  # Subtree root disappeared mid-scan
+
+            node = FileNode(
+                path=sys.intern(path), name=name, is_dir=is_dir,
+                size_bytes=size, mtime=mtime, atime=atime, ctime=ctime,
+                parent=parent_node, scan_error=error_str
+            )
+            parent_node.children.append(node)
+            all_nodes[node.path] = node
+
+            if error_str is not None:
+                scan_result.scan_errors.append(f"Cannot access: {path} ({error_type})")
+                continue
+
+            listing = listings.get(parent_path)
+            if listing is not None:
+                listing.append((name, is_dir, size, mtime, atime, ctime))
+
+            node.is_temp_candidate = filters.is_temp_node(node)
+            if is_dir:
+                scan_result.all_dirs.append(node)
+                scan_result.total_dirs_count += 1
+            else:
+                scan_result.all_files.append(node)
+                scan_result.total_files_count += 1
+
+        for dir_path, error_str, summary in dir_errors:
+            node = all_nodes.get(dir_path)
+            if node is not None:
+                node.scan_error = error_str
+            scan_result.scan_errors.append(summary)
+
+        now = time.monotonic()
+        with _dir_cache_lock:
+            for dir_path, dir_mtime in dir_mtimes:
+                _DIR_CACHE[dir_path] = (
+                    dir_mtime, now, self.skip_symlinks, listings[dir_path])
+
+    def _aggregate_folder_sizes(self, scan_result: ScanResult):
+        """
+        Rolls file sizes up into their folders in one flat pass.
+
+        all_nodes preserves insertion order, and every node is inserted
+        after its parent, so iterating the values in *reverse* visits
+        children before parents: adding each node's size to its parent
+        once is enough — by the time a directory is reached, its whole
+        subtree has already been accumulated into it. No recursion, no
+        second tree walk.
+        """
+        for node in reversed(list(scan_result.all_nodes.values())):
+            if node.parent is not None:
+                node.parent.size_bytes += node.size_bytes
 
     def cancel(self):
         """Signals the scanning thread to stop."""
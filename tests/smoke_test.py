@@ -1,7 +1,9 @@
 # --- tests/smoke_test.py ---
 
 import os
+import shutil
 import sys
+import tempfile
 import time
 import unittest
 
@@ -164,6 +166,135 @@ class TestFilters(unittest.TestCase):
         self.assertNotIn(self.root, result)
         print("PASS: filters.get_empty_folders")
 
+    def test_filters_accept_file_index(self):
+        print("Testing: filters via FileIndex (SoA path)...")
+        # The scanner passes a prebuilt FileIndex instead of raw nodes;
+        # both input forms must produce the same results.
+        index = filters.FileIndex(self.all_files)
+        self.assertEqual(
+            filters.get_large_files(index, min_size_mb=100),
+            filters.get_large_files(self.all_files, min_size_mb=100))
+        self.assertEqual(
+            filters.get_old_files(index, min_days_old=365),
+            filters.get_old_files(self.all_files, min_days_old=365))
+        self.assertEqual(
+            filters.get_zero_byte_files(index),
+            filters.get_zero_byte_files(self.all_files))
+        print("PASS: filters via FileIndex")
+
+    def test_display_cap_truncation(self):
+        print("Testing: filters.DISPLAY_CAP truncation...")
+        now = time.time()
+        many_zero = [
+            FileNode(path=f"/fake/zero_{i:05d}", name=f"zero_{i:05d}",
+                     is_dir=False, size_bytes=0,
+                     mtime=now, atime=now, ctime=now)
+            for i in range(filters.DISPLAY_CAP + 100)
+        ]
+        result = filters.get_zero_byte_files(many_zero)
+        self.assertEqual(len(result), filters.DISPLAY_CAP)
+        # Capped results keep the sort order (by path)
+        self.assertEqual(result[0].path, "/fake/zero_00000")
+        print("PASS: filters.DISPLAY_CAP truncation")
+
+
+class TestDuplicates(unittest.TestCase):
+    """Tests for the duplicate-detection pipeline in filters.py"""
+
+    def setUp(self):
+        """Create real temp files (hashing needs actual content)"""
+        print("\nSetting up temp files for duplicate detection...")
+        self.tmp_dir = tempfile.mkdtemp()
+
+        def make_file(name, content):
+            path = os.path.join(self.tmp_dir, name)
+            with open(path, 'wb') as f:
+                f.write(content)
+            st = os.stat(path)
+            return FileNode(
+                path=path, name=name, is_dir=False,
+                size_bytes=st.st_size,
+                mtime=st.st_mtime, atime=st.st_atime, ctime=st.st_ctime
+            )
+
+        # Two identical files, one same-size-but-different file, one
+        # unique size, and a zero-byte file (always ignored).
+        self.dup_a = make_file("dup_a.bin", b"A" * 4096)
+        self.dup_b = make_file("dup_b.bin", b"A" * 4096)
+        self.same_size = make_file("same_size.bin", b"B" * 4096)
+        self.unique = make_file("unique.bin", b"C" * 123)
+        self.zero = make_file("zero.bin", b"")
+
+        self.files = {self.dup_a, self.dup_b, self.same_size,
+                      self.unique, self.zero}
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _find(self, files):
+        return filters.find_duplicates(files, progress_callback=lambda i, n: None)
+
+    def test_find_duplicates(self):
+        print("Testing: filters.find_duplicates...")
+        result = self._find(self.files)
+        # Exactly one duplicate set: the two identical files. The
+        # same-size file must be separated by the fingerprint stage.
+        self.assertEqual(len(result), 1)
+        (nodes,) = result.values()
+        self.assertEqual({n.path for n in nodes},
+                         {self.dup_a.path, self.dup_b.path})
+        print("PASS: filters.find_duplicates")
+
+    def test_find_duplicates_serial_and_threaded_agree(self):
+        print("Testing: filters.find_duplicates serial vs threaded...")
+        original = filters._default_hash_workers
+        try:
+            filters._default_hash_workers = lambda sample_path: 1
+            serial = self._find(self.files)
+            for node in self.files:  # drop cached digests between runs
+                node.content_hash = None
+                node.partial_fp = None
+            filters._default_hash_workers = lambda sample_path: 4
+            threaded = self._find(self.files)
+        finally:
+            filters._default_hash_workers = original
+        self.assertEqual(
+            {frozenset(n.path for n in v) for v in serial.values()},
+            {frozenset(n.path for n in v) for v in threaded.values()})
+        print("PASS: filters.find_duplicates serial vs threaded")
+
+    def test_partial_fingerprint(self):
+        print("Testing: filters._partial_fingerprint...")
+        fp_a = filters._partial_fingerprint(self.dup_a.path, self.dup_a.size_bytes)
+        fp_b = filters._partial_fingerprint(self.dup_b.path, self.dup_b.size_bytes)
+        fp_other = filters._partial_fingerprint(self.same_size.path, self.same_size.size_bytes)
+        self.assertIsNotNone(fp_a)
+        self.assertEqual(fp_a, fp_b)
+        self.assertNotEqual(fp_a, fp_other)
+        # Unreadable file: returns None instead of raising
+        missing = os.path.join(self.tmp_dir, "missing.bin")
+        self.assertIsNone(filters._partial_fingerprint(missing, 4096))
+        print("PASS: filters._partial_fingerprint")
+
+    def test_cached_fingerprint_is_reused(self):
+        print("Testing: filters.find_duplicates cached partial_fp...")
+        # Pre-cooked identical fingerprints force both files into the
+        # full-hash stage without any fingerprint I/O; the content hash
+        # must still tell them apart.
+        self.dup_a.partial_fp = b"cached-fp"
+        self.same_size.partial_fp = b"cached-fp"
+        result = self._find({self.dup_a, self.same_size})
+        self.assertEqual(len(result), 0)
+        # The fingerprints were taken as-is, not recomputed
+        self.assertEqual(self.dup_a.partial_fp, b"cached-fp")
+        print("PASS: filters.find_duplicates cached partial_fp")
+
+    def test_compute_hash_error_returns_none(self):
+        print("Testing: filters.compute_hash on a missing file...")
+        missing = os.path.join(self.tmp_dir, "missing.bin")
+        self.assertIsNone(filters.compute_hash(missing))
+        print("PASS: filters.compute_hash error path")
+
 
 if __name__ == "__main__":
     print("--- Running Disk Cleaner Smoke Tests ---")
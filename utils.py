@@ -1,28 +1,53 @@
 # --- utils.py ---
 
+import math
 import os
 import shutil
+import time
+from functools import lru_cache
 from typing import Tuple
 
+_SECONDS_PER_DAY = 60 * 60 * 24
+
+_UNITS = ['B', 'KB', 'MB', 'GB', 'TB', 'PB']
+_THRESH = [1000.0 ** i for i in range(len(_UNITS))]
+
+
+@lru_cache(maxsize=64)
+def _drive_root(path: str) -> str:
+    """
+    Resolves a path to the root of its drive (e.g. 'C:\\' on Windows,
+    the path itself on POSIX). Cached: the UI polls drive usage for the
+    same few paths repeatedly, and abspath/splitdrive re-parse the
+    string on every call.
+    """
+    drive_root = os.path.abspath(path)
+    if os.name == 'nt':
+        drive_root = os.path.splitdrive(drive_root)[0] + os.sep
+    return drive_root
+
+@lru_cache(maxsize=4096)
 def format_bytes(size_bytes: int) -> str:
     """
 Signature: `format_bytes(size_bytes: int) -> str`
 
 Converts a size in bytes to a human-readable string (KB, MB, GB, TB).
 Uses decimal (1000) instead of binary (1024) for storage representation.
+Picks the unit in O(1) via log10 (no division loop) and caches results,
+since file tables render the same sizes over and over.
 """
     if size_bytes < 0:
         return "0 B"
-    
-    units = ['B', 'KB', 'MB', 'GB', 'TB', 'PB']
-    power = 1000.0  # Use decimal (base 1000)
-    
-    i = 0
-    while size_bytes >= power and i < len(units) - 1:
-        size_bytes /= power
-        i += 1
-        
-    return f"{size_bytes:.2f} {units[i]}"
+    if size_bytes < 1000:
+        return f"{size_bytes:.2f} B"
+
+    i = min(len(_UNITS) - 1, int(math.log10(size_bytes)) // 3)
+    # log10 can round up just below a threshold (e.g. 999999999999999
+    # gives 15.0); step back down so those render as 1000.00 of the
+    # smaller unit, like the old division loop did.
+    if size_bytes < _THRESH[i]:
+        i -= 1
+    return f"{size_bytes / _THRESH[i]:.2f} {_UNITS[i]}"
 
 
 def get_drive_usage(path: str) -> Tuple[int, int, int]:
@@ -37,11 +62,7 @@ Returns (0, 0, 0) on failure (e.g., path not found).
     try:
         # For Windows, get the drive letter (e.g., 'C:\\')
         # For POSIX, shutil.disk_usage typically uses the path itself.
-        drive_root = os.path.abspath(path)
-        if os.name == 'nt':
-            drive_root = os.path.splitdrive(drive_root)[0] + os.sep
-        
-        usage = shutil.disk_usage(drive_root)
+        usage = shutil.disk_usage(_drive_root(path))
         return usage.total, usage.used, usage.free
     except FileNotFoundError:
         return (0, 0, 0) # Path doesn't exist
@@ -103,9 +124,7 @@ Signature: `get_time_ago_days(timestamp: float) -> int`
 
 Calculates how many days ago a given timestamp occurred.
 Returns the number of days as an integer.
+(Display helper only — the age *filters* compare mtimes against a
+single precomputed cutoff instead of calling this per file.)
 """
-    import time
-    now = time.time()
-    seconds_ago = now - timestamp
-    days_ago = seconds_ago / (60 * 60 * 24)
-    return int(days_ago)
\ No newline at end of file
+    return int((time.time() - timestamp) / _SECONDS_PER_DAY)
\ No newline at end of file